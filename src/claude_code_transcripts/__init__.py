@@ -3,12 +3,12 @@
 from pathlib import Path
 
 import click
-from jinja2 import Environment, PackageLoader
 
 from .models import ConversationStats
 from .parsing import (
     extract_text_from_content,
     get_session_summary,
+    iter_session_entries,
     parse_session_file,
 )
 from .discovery import (
@@ -38,6 +38,7 @@ from .analysis import (
     LONG_TEXT_THRESHOLD,
     detect_github_repo,
     analyze_conversation,
+    merge_conversation_stats,
     format_tool_stats,
 )
 from .gist import (
@@ -49,6 +50,7 @@ from .html_generation import (
     CSS,
     JS,
     PROMPTS_PER_PAGE,
+    SYNTHETIC_PROMPT_PREFIXES,
     generate_pagination_html,
     generate_index_pagination_html,
     generate_html,
@@ -56,20 +58,10 @@ from .html_generation import (
     generate_batch_html,
     get_template,
 )
-
-# Set up Jinja2 environment
-_jinja_env = Environment(
-    loader=PackageLoader("claude_code_transcripts", "templates"),
-    autoescape=True,
-)
-
-
-# Load macros template and expose macros
-_macros_template = _jinja_env.get_template("macros.html")
-_macros = _macros_template.module
+from .templating import jinja_env, macros
 
 # Initialize rendering module with dependencies
-rendering.init(_macros, COMMIT_PATTERN)
+rendering.init(macros, COMMIT_PATTERN)
 
 
 @click.group()
@@ -89,7 +81,19 @@ def cli():
     default=None,
     help="Path to Claude projects directory (default: ~/.claude/projects)",
 )
-def serve(host: str, port: int, reload: bool, projects_dir: Path | None):
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Cache rendered sessions in this directory (default: no caching)",
+)
+def serve(
+    host: str,
+    port: int,
+    reload: bool,
+    projects_dir: Path | None,
+    cache_dir: Path | None,
+):
     """Start the web server to browse transcripts."""
     import uvicorn
     from .web import create_app
@@ -101,7 +105,7 @@ def serve(host: str, port: int, reload: bool, projects_dir: Path | None):
     click.echo(f"Projects directory: {projects_dir}")
 
     # Create the app
-    app = create_app(projects_dir=projects_dir)
+    app = create_app(projects_dir=projects_dir, cache_dir=cache_dir)
 
     # Run with uvicorn
     uvicorn.run(
@@ -1,7 +1,9 @@
 """Analysis functions for extracting statistics from conversations."""
 
-import json
 import re
+from collections.abc import Iterable
+from functools import lru_cache
+from operator import itemgetter
 
 from .models import ConversationStats
 
@@ -14,12 +16,18 @@ GITHUB_REPO_PATTERN = re.compile(
     r"github\.com/([a-zA-Z0-9_-]+/[a-zA-Z0-9_-]+)/pull/new/"
 )
 
+# Literal substrings every match of the patterns above must contain. Checking
+# for these with ``in`` is far cheaper than running the regex over long tool
+# output (git logs, test runs) that can't possibly match.
+_COMMIT_MARKER = "] "
+_GITHUB_REPO_MARKER = "/pull/new/"
+
 LONG_TEXT_THRESHOLD = (
     300  # Characters - text blocks longer than this are shown in index
 )
 
 
-def detect_github_repo(loglines):
+def detect_github_repo(loglines: Iterable[dict]) -> str | None:
     """
     Detect GitHub repo from git push output in tool results.
 
@@ -31,44 +39,53 @@ def detect_github_repo(loglines):
     for entry in loglines:
         message = entry.get("message", {})
         content = message.get("content", [])
-        if not isinstance(content, list):
+        if type(content) is not list:
             continue
         for block in content:
-            if not isinstance(block, dict):
+            if type(block) is not dict:
                 continue
             if block.get("type") == "tool_result":
                 result_content = block.get("content", "")
-                if isinstance(result_content, str):
+                if (
+                    type(result_content) is str
+                    and _GITHUB_REPO_MARKER in result_content
+                ):
                     match = GITHUB_REPO_PATTERN.search(result_content)
                     if match:
                         return match.group(1)
     return None
 
 
-def analyze_conversation(messages) -> ConversationStats:
+def analyze_conversation(
+    messages: Iterable[tuple[str, dict, str]],
+) -> ConversationStats:
     """Analyze messages in a conversation to extract stats and long texts.
 
+    Args:
+        messages: Iterable of (log_type, message_data, timestamp) tuples,
+                  where message_data is the parsed message dict.
+
     Returns:
-        ConversationStats with tool_counts, long_texts, and commits.
+        ConversationStats with tool_counts, long_texts, commits and the
+        GitHub repo detected from git push output (as detect_github_repo).
     """
     tool_counts: dict[str, int] = {}
     long_texts: list[str] = []
     commits: list[tuple[str, str, str]] = []
+    github_repo: str | None = None
 
-    for log_type, message_json, timestamp in messages:
-        if not message_json:
-            continue
-        try:
-            message_data = json.loads(message_json)
-        except json.JSONDecodeError:
+    for log_type, message_data, timestamp in messages:
+        if not message_data:
             continue
 
+        # Parsed JSON only contains exact list/dict/str instances, so the
+        # cheaper ``type(x) is`` check is safe here (no subclass walk)
         content = message_data.get("content", [])
-        if not isinstance(content, list):
+        if type(content) is not list:
             continue
 
         for block in content:
-            if not isinstance(block, dict):
+            if type(block) is not dict:
                 continue
             block_type = block.get("type", "")
 
@@ -78,9 +95,16 @@ def analyze_conversation(messages) -> ConversationStats:
             elif block_type == "tool_result":
                 # Check for git commit output
                 result_content = block.get("content", "")
-                if isinstance(result_content, str):
+                if type(result_content) is not str:
+                    continue
+                if _COMMIT_MARKER in result_content:
                     for match in COMMIT_PATTERN.finditer(result_content):
                         commits.append((match.group(1), match.group(2), timestamp))
+                # Only the first repo matters, so stop looking once found
+                if github_repo is None and _GITHUB_REPO_MARKER in result_content:
+                    repo_match = GITHUB_REPO_PATTERN.search(result_content)
+                    if repo_match:
+                        github_repo = repo_match.group(1)
             elif block_type == "text":
                 text = block.get("text", "")
                 if len(text) >= LONG_TEXT_THRESHOLD:
@@ -90,31 +114,66 @@ def analyze_conversation(messages) -> ConversationStats:
         tool_counts=tool_counts,
         long_texts=long_texts,
         commits=commits,
+        github_repo=github_repo,
+    )
+
+
+def merge_conversation_stats(
+    stats_list: Iterable[ConversationStats],
+) -> ConversationStats:
+    """Combine several ConversationStats into one, preserving order.
+
+    Equivalent to analyzing the concatenated messages, without re-scanning them.
+    """
+    tool_counts: dict[str, int] = {}
+    long_texts: list[str] = []
+    commits: list[tuple[str, str, str]] = []
+    github_repo: str | None = None
+
+    for stats in stats_list:
+        for tool_name, count in stats.tool_counts.items():
+            tool_counts[tool_name] = tool_counts.get(tool_name, 0) + count
+        long_texts.extend(stats.long_texts)
+        commits.extend(stats.commits)
+        if github_repo is None:
+            github_repo = stats.github_repo
+
+    return ConversationStats(
+        tool_counts=tool_counts,
+        long_texts=long_texts,
+        commits=commits,
+        github_repo=github_repo,
     )
 
 
-def format_tool_stats(tool_counts):
+# Abbreviations for common tool names in index stats
+TOOL_ABBREVIATIONS: dict[str, str] = {
+    "Bash": "bash",
+    "Read": "read",
+    "Write": "write",
+    "Edit": "edit",
+    "Glob": "glob",
+    "Grep": "grep",
+    "Task": "task",
+    "TodoWrite": "todo",
+    "WebFetch": "fetch",
+    "WebSearch": "search",
+}
+
+
+@lru_cache(maxsize=256)
+def _short_name(name: str) -> str:
+    """Return the abbreviated display name for a tool."""
+    return TOOL_ABBREVIATIONS.get(name, name.lower())
+
+
+def format_tool_stats(tool_counts: dict[str, int]) -> str:
     """Format tool counts into a concise summary string."""
     if not tool_counts:
         return ""
 
-    # Abbreviate common tool names
-    abbrev = {
-        "Bash": "bash",
-        "Read": "read",
-        "Write": "write",
-        "Edit": "edit",
-        "Glob": "glob",
-        "Grep": "grep",
-        "Task": "task",
-        "TodoWrite": "todo",
-        "WebFetch": "fetch",
-        "WebSearch": "search",
-    }
-
     parts = []
-    for name, count in sorted(tool_counts.items(), key=lambda x: -x[1]):
-        short_name = abbrev.get(name, name.lower())
-        parts.append(f"{count} {short_name}")
+    for name, count in sorted(tool_counts.items(), key=itemgetter(1), reverse=True):
+        parts.append(f"{count} {_short_name(name)}")
 
     return " · ".join(parts)
@@ -89,6 +89,11 @@ def get_project_display_name(folder_name):
     return folder_name
 
 
+# Session summaries from the last walk of each projects folder, as
+# {folder: {session path: (mtime_ns, size, summary)}}
+_summary_cache = {}
+
+
 def find_all_sessions(folder, include_agents=False):
     """Find all sessions in a Claude projects folder, grouped by project.
 
@@ -105,6 +110,10 @@ def find_all_sessions(folder, include_agents=False):
         return []
 
     projects = {}
+    # Reuse summaries of files unchanged since the last walk; only files seen
+    # in this walk are kept, so deleted sessions don't accumulate
+    previous_summaries = _summary_cache.get(folder, {})
+    summaries = {}
 
     for session_file in folder.glob("**/*.jsonl"):
         # Skip agent files unless requested
@@ -112,7 +121,14 @@ def find_all_sessions(folder, include_agents=False):
             continue
 
         # Get summary and skip boring sessions
-        summary = get_session_summary(session_file)
+        stat = session_file.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = previous_summaries.get(session_file)
+        if cached is not None and cached[:2] == version:
+            summary = cached[2]
+        else:
+            summary = get_session_summary(session_file)
+        summaries[session_file] = (*version, summary)
         if summary.lower() == "warmup" or summary == "(no summary)":
             continue
 
@@ -127,7 +143,6 @@ def find_all_sessions(folder, include_agents=False):
                 "sessions": [],
             }
 
-        stat = session_file.stat()
         projects[project_key]["sessions"].append(
             {
                 "path": session_file,
@@ -137,6 +152,8 @@ def find_all_sessions(folder, include_agents=False):
             }
         )
 
+    _summary_cache[folder] = summaries
+
     # Sort sessions within each project by mtime (most recent first)
     for project in projects.values():
         project["sessions"].sort(key=lambda s: s["mtime"], reverse=True)
@@ -1,32 +1,30 @@
 """HTML generation functions for converting session data to HTML pages."""
 
-import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 
 import click
-from jinja2 import Environment, PackageLoader
+from markupsafe import Markup, escape
 
 from . import rendering
 from .analysis import (
     analyze_conversation,
     detect_github_repo,
     format_tool_stats,
+    merge_conversation_stats,
 )
 from .discovery import find_all_sessions
-from .parsing import extract_text_from_content, parse_session_file
-from .rendering import make_msg_id, render_markdown_text, render_message
-
-
-# Set up Jinja2 environment
-_jinja_env = Environment(
-    loader=PackageLoader("claude_code_transcripts", "templates"),
-    autoescape=True,
+from .parsing import (
+    extract_text_from_content,
+    iter_session_entries,
+    parse_session_file,
 )
-
-# Load macros template and expose macros
-_macros_template = _jinja_env.get_template("macros.html")
-_macros = _macros_template.module
+from .rendering import make_msg_id, render_markdown_text, render_message
+from .templating import jinja_env
 
 
 def _load_asset(filename: str) -> str:
@@ -37,49 +35,174 @@ def _load_asset(filename: str) -> str:
 
 def get_template(name):
     """Get a Jinja2 template by name."""
-    return _jinja_env.get_template(name)
+    return jinja_env.get_template(name)
 
 
 # Load CSS and JS assets from template files
 CSS = _load_asset("styles.css")
 JS = _load_asset("main.js")
 
-PROMPTS_PER_PAGE = 5
 
+def _asset_context(assets_url):
+    """Template context for CSS/JS: inline, or linked from assets_url.
 
-def generate_pagination_html(current_page, total_pages):
-    return _macros.pagination(current_page, total_pages)
+    Args:
+        assets_url: Relative URL of the directory holding styles.css and
+                    main.js (e.g. "../../"), or None to inline the assets
+    """
+    if assets_url is None:
+        return {"css": CSS, "js": JS}
+    return {"css_href": f"{assets_url}styles.css", "js_src": f"{assets_url}main.js"}
 
 
-def generate_index_pagination_html(total_pages):
-    """Generate pagination for index page where Index is current (first page)."""
-    return _macros.index_pagination(total_pages)
+def _write_assets(output_dir):
+    """Write styles.css and main.js into output_dir for linked pages."""
+    (output_dir / "styles.css").write_text(CSS, encoding="utf-8")
+    (output_dir / "main.js").write_text(JS, encoding="utf-8")
 
 
-def _generate_html_from_data(data, output_dir, github_repo=None, echo=print):
-    """Core HTML generation logic - used by both file and API paths.
+# Resolve page templates once at import rather than per page/session
+_PAGE_TMPL = get_template("page.html")
+_INDEX_TMPL = get_template("index.html")
+_PROJECT_TMPL = get_template("project_index.html")
+_MASTER_TMPL = get_template("master_index.html")
 
-    Args:
-        data: Session data dict with 'loglines' key
-        output_dir: Path to output directory
-        github_repo: GitHub repo (owner/name) for commit links, or None to auto-detect
-        echo: Function to use for output messages (print or click.echo)
-    """
-    output_dir = Path(output_dir)
-    output_dir.mkdir(exist_ok=True, parents=True)
+PROMPTS_PER_PAGE = 5
 
-    loglines = data.get("loglines", [])
+# ProcessPoolExecutor rejects more than 61 workers on Windows
+_MAX_WINDOWS_WORKERS = 61
 
-    # Auto-detect GitHub repo if not provided
-    if github_repo is None:
-        github_repo = detect_github_repo(loglines)
-        if github_repo:
-            echo(f"Auto-detected GitHub repo: {github_repo}")
+# User messages starting with these are injected by Claude Code (hooks, slash
+# command wrappers, local command caveats) and are left out of the index
+SYNTHETIC_PROMPT_PREFIXES = ("Stop hook feedback:", "<command-name>", "Caveat:")
 
-    # Set GitHub repo for render functions
-    rendering.set_github_repo(github_repo)
 
-    conversations = []
+# Index and pagination fragments are built with plain string formatting rather
+# than Jinja macros: they are emitted once per prompt/commit/page, and a macro
+# call costs far more than the formatting itself. Dynamic values are escaped
+# with markupsafe exactly as autoescaping would; *_html arguments are trusted.
+_INDEX_ITEM_HTML = (
+    '\n<div class="index-item"><a href="{link}"><div class="index-item-header">'
+    '<span class="index-item-number">#{prompt_num}</span>'
+    '<time datetime="{timestamp}" data-timestamp="{timestamp}">{timestamp}</time>'
+    '</div><div class="index-item-content">{rendered_content}</div></a>'
+    "{stats_html}</div>"
+)
+_INDEX_COMMIT_BODY_HTML = (
+    '<div class="index-commit-header"><span class="index-commit-hash">{short_hash}</span>'
+    '<time datetime="{timestamp}" data-timestamp="{timestamp}">{timestamp}</time>'
+    '</div><div class="index-commit-msg">{commit_msg}</div>'
+)
+_INDEX_LONG_TEXT_HTML = (
+    '\n<div class="index-item-long-text"><div class="truncatable">'
+    '<div class="truncatable-content"><div class="index-item-long-text-content">'
+    "{rendered_content}</div></div>"
+    '<button class="expand-btn">Show more</button></div></div>'
+)
+
+
+def generate_pagination_html(current_page, total_pages):
+    if total_pages <= 1:
+        return Markup(
+            '\n\n<div class="pagination">'
+            '<a href="index.html" class="index-link">Index</a></div>\n'
+        )
+    parts = [
+        '\n\n<div class="pagination">\n<a href="index.html" class="index-link">Index</a>\n'
+    ]
+    if current_page > 1:
+        parts.append(f'<a href="page-{current_page - 1:03d}.html">&larr; Prev</a>\n')
+    else:
+        parts.append('<span class="disabled">&larr; Prev</span>\n')
+    for page in range(1, total_pages + 1):
+        if page == current_page:
+            parts.append(f'<span class="current">{page}</span>\n')
+        else:
+            parts.append(f'<a href="page-{page:03d}.html">{page}</a>\n')
+    if current_page < total_pages:
+        parts.append(f'<a href="page-{current_page + 1:03d}.html">Next &rarr;</a>')
+    else:
+        parts.append('<span class="disabled">Next &rarr;</span>')
+    parts.append("\n</div>\n")
+    return Markup("".join(parts))
+
+
+def generate_index_pagination_html(total_pages):
+    """Generate pagination for index page where Index is current (first page)."""
+    if total_pages < 1:
+        return Markup(
+            '\n\n<div class="pagination"><span class="current">Index</span></div>\n'
+        )
+    parts = [
+        '\n\n<div class="pagination">\n<span class="current">Index</span>\n'
+        '<span class="disabled">&larr; Prev</span>\n'
+    ]
+    for page in range(1, total_pages + 1):
+        parts.append(f'<a href="page-{page:03d}.html">{page}</a>\n')
+    parts.append('<a href="page-001.html">Next &rarr;</a>\n</div>\n')
+    return Markup("".join(parts))
+
+
+def _index_item_html(prompt_num, link, timestamp, rendered_content, stats_html):
+    """Render a prompt entry in the index timeline."""
+    return _INDEX_ITEM_HTML.format(
+        prompt_num=prompt_num,
+        link=escape(link),
+        timestamp=escape(timestamp),
+        rendered_content=rendered_content,
+        stats_html=stats_html,
+    )
+
+
+def _index_commit_html(commit_hash, commit_msg, timestamp, github_repo):
+    """Render a commit entry in the index timeline, linked if repo is known."""
+    body = _INDEX_COMMIT_BODY_HTML.format(
+        short_hash=escape(commit_hash[:7]),
+        timestamp=escape(timestamp),
+        commit_msg=escape(commit_msg),
+    )
+    if github_repo:
+        github_link = escape(f"https://github.com/{github_repo}/commit/{commit_hash}")
+        return f'<div class="index-commit"><a href="{github_link}">{body}</a></div>'
+    return f'<div class="index-commit">{body}</div>'
+
+
+def _index_stats_html(tool_stats_str, long_texts_html):
+    """Render the tool stats and long texts shown under an index item."""
+    if not tool_stats_str and not long_texts_html:
+        return ""
+    tool_stats_html = f"<span>{escape(tool_stats_str)}</span>" if tool_stats_str else ""
+    return f'<div class="index-item-stats">{tool_stats_html}{long_texts_html}\n</div>'
+
+
+def _index_long_text_html(rendered_content):
+    """Render a long assistant text excerpt shown in the index."""
+    return _INDEX_LONG_TEXT_HTML.format(rendered_content=rendered_content)
+
+
+def _render_conversation(conv):
+    """Render a conversation's messages to a list of HTML fragments."""
+    messages_html = []
+    is_first = True
+    for log_type, message_data, timestamp in conv["messages"]:
+        msg_html = render_message(log_type, message_data, timestamp)
+        if msg_html:
+            # Wrap continuation summaries in collapsed details
+            if is_first and conv.get("is_continuation"):
+                msg_html = f'<details class="continuation"><summary>Session continuation summary</summary>{msg_html}</details>'
+            messages_html.append(msg_html)
+        is_first = False
+    return messages_html
+
+
+def _iter_conversations(loglines, preamble=None):
+    """Group loglines into conversations, each starting at a user prompt.
+
+    Conversations are yielded as soon as the next prompt begins, so only one
+    conversation's messages are held at a time. Entries before the first
+    prompt belong to no conversation; if preamble is a list they are
+    appended to it.
+    """
     current_conv = None
     for entry in loglines:
         log_type = entry.get("type")
@@ -88,8 +211,6 @@ def _generate_html_from_data(data, output_dir, github_repo=None, echo=print):
         message_data = entry.get("message", {})
         if not message_data:
             continue
-        # Convert message dict to JSON string for compatibility with existing render functions
-        message_json = json.dumps(message_data)
         is_user_prompt = False
         user_text = None
         if log_type == "user":
@@ -100,58 +221,141 @@ def _generate_html_from_data(data, output_dir, github_repo=None, echo=print):
                 user_text = text
         if is_user_prompt:
             if current_conv:
-                conversations.append(current_conv)
+                yield current_conv
             current_conv = {
                 "user_text": user_text,
                 "timestamp": timestamp,
-                "messages": [(log_type, message_json, timestamp)],
+                "messages": [(log_type, message_data, timestamp)],
                 "is_continuation": bool(is_compact_summary),
             }
         elif current_conv:
-            current_conv["messages"].append((log_type, message_json, timestamp))
+            current_conv["messages"].append((log_type, message_data, timestamp))
+        elif preamble is not None:
+            preamble.append(entry)
     if current_conv:
-        conversations.append(current_conv)
+        yield current_conv
+
+
+def _generate_html_from_data(
+    data,
+    output_dir,
+    github_repo=None,
+    echo=print,
+    warn_if_no_repo=False,
+    assets_url=None,
+):
+    """Core HTML generation logic - used by both file and API paths.
+
+    Args:
+        data: Session data dict with 'loglines' key
+        output_dir: Path to output directory
+        github_repo: GitHub repo (owner/name) for commit links, or None to auto-detect
+        echo: Function to use for output messages (print or click.echo)
+        warn_if_no_repo: Warn when auto-detection finds no GitHub repo
+        assets_url: Relative URL of shared styles.css/main.js, or None to
+                    inline them into every page
+    """
+    loglines = data.get("loglines", [])
+    _generate_html_from_entries(
+        lambda: loglines, output_dir, github_repo, echo, warn_if_no_repo, assets_url
+    )
+
+
+def _generate_html_from_entries(
+    iter_entries,
+    output_dir,
+    github_repo=None,
+    echo=print,
+    warn_if_no_repo=False,
+    assets_url=None,
+):
+    """Generate HTML from a source of loglines that can be read twice.
+
+    iter_entries is called once to analyze every conversation and again to
+    render the pages, so with a streaming source only the page being
+    rendered has its messages in memory. Arguments are otherwise as for
+    _generate_html_from_data.
+    """
+    # First pass: keep each conversation's index details and stats, not its
+    # messages. This runs before output_dir is created, so unreadable
+    # sessions fail without leaving an empty directory behind.
+    conversations = []
+    per_conv_stats = []
+    preamble = []
+    for conv in _iter_conversations(iter_entries(), preamble):
+        per_conv_stats.append(analyze_conversation(conv["messages"]))
+        conv["message_count"] = len(conv.pop("messages"))
+        conversations.append(conv)
 
     total_convs = len(conversations)
     total_pages = (total_convs + PROMPTS_PER_PAGE - 1) // PROMPTS_PER_PAGE
 
-    for page_num in range(1, total_pages + 1):
-        start_idx = (page_num - 1) * PROMPTS_PER_PAGE
-        end_idx = min(start_idx + PROMPTS_PER_PAGE, total_convs)
-        page_convs = conversations[start_idx:end_idx]
-        messages_html = []
-        for conv in page_convs:
-            is_first = True
-            for log_type, message_json, timestamp in conv["messages"]:
-                msg_html = render_message(log_type, message_json, timestamp)
-                if msg_html:
-                    # Wrap continuation summaries in collapsed details
-                    if is_first and conv.get("is_continuation"):
-                        msg_html = f'<details class="continuation"><summary>Session continuation summary</summary>{msg_html}</details>'
-                    messages_html.append(msg_html)
-                is_first = False
+    # Auto-detect GitHub repo if not provided
+    if github_repo is None:
+        # Push output can come before the first prompt, e.g. in a session
+        # resumed from another one, so check that first
+        github_repo = detect_github_repo(preamble) or next(
+            (stats.github_repo for stats in per_conv_stats if stats.github_repo), None
+        )
+        if github_repo:
+            echo(f"Auto-detected GitHub repo: {github_repo}")
+        elif warn_if_no_repo:
+            echo(
+                "Warning: Could not auto-detect GitHub repo. Commit links will be disabled."
+            )
+
+    # Set GitHub repo for render functions
+    rendering.set_github_repo(github_repo)
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(exist_ok=True, parents=True)
+    assets = _asset_context(assets_url)
+
+    # Second pass: render each page as soon as its conversations have been
+    # read, so only one page of messages and HTML is held. Writes go to a
+    # background thread so page N+1 renders while N is written.
+    page_writes = []
+
+    def write_page(page_num, page_convs):
+        messages_html = [
+            msg_html for conv in page_convs for msg_html in _render_conversation(conv)
+        ]
         pagination_html = generate_pagination_html(page_num, total_pages)
-        page_template = get_template("page.html")
-        page_content = page_template.render(
-            css=CSS,
-            js=JS,
+        page_content = _PAGE_TMPL.render(
+            **assets,
             page_num=page_num,
             total_pages=total_pages,
             pagination_html=pagination_html,
             messages_html="".join(messages_html),
         )
-        (output_dir / f"page-{page_num:03d}.html").write_text(
-            page_content, encoding="utf-8"
+        page_path = output_dir / f"page-{page_num:03d}.html"
+        page_writes.append(
+            writer.submit(page_path.write_text, page_content, encoding="utf-8")
         )
         echo(f"Generated page-{page_num:03d}.html")
 
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        page_convs = []
+        page_num = 1
+        # Ignore conversations appended to the session since the first pass
+        for conv in islice(_iter_conversations(iter_entries()), total_convs):
+            page_convs.append(conv)
+            if len(page_convs) == PROMPTS_PER_PAGE:
+                write_page(page_num, page_convs)
+                page_convs = []
+                page_num += 1
+        if page_convs:
+            write_page(page_num, page_convs)
+    # Surface any error raised while writing
+    for page_write in page_writes:
+        page_write.result()
+
     # Calculate overall stats and collect all commits for timeline
     total_tool_counts = {}
     total_messages = 0
     all_commits = []  # (timestamp, hash, message, page_num, conv_index)
-    for i, conv in enumerate(conversations):
-        total_messages += len(conv["messages"])
-        stats = analyze_conversation(conv["messages"])
+    for i, (conv, stats) in enumerate(zip(conversations, per_conv_stats)):
+        total_messages += conv["message_count"]
         for tool, count in stats.tool_counts.items():
             total_tool_counts[tool] = total_tool_counts.get(tool, 0) + count
         page_num = (i // PROMPTS_PER_PAGE) + 1
@@ -163,12 +367,21 @@ def _generate_html_from_data(data, output_dir, github_repo=None, echo=print):
     # Build timeline items: prompts and commits merged by timestamp
     timeline_items = []
 
+    # group_ends[i] is the index after the run of continuations following
+    # conversation i, found in one backward pass
+    group_ends = [total_convs] * total_convs
+    next_non_continuation = total_convs
+    for i in range(total_convs - 1, -1, -1):
+        group_ends[i] = next_non_continuation
+        if not conversations[i].get("is_continuation"):
+            next_non_continuation = i
+
     # Add prompts
     prompt_num = 0
     for i, conv in enumerate(conversations):
         if conv.get("is_continuation"):
             continue
-        if conv["user_text"].startswith("Stop hook feedback:"):
+        if conv["user_text"].startswith(SYNTHETIC_PROMPT_PREFIXES):
             continue
         prompt_num += 1
         page_num = (i // PROMPTS_PER_PAGE) + 1
@@ -176,33 +389,25 @@ def _generate_html_from_data(data, output_dir, github_repo=None, echo=print):
         link = f"page-{page_num:03d}.html#{msg_id}"
         rendered_content = render_markdown_text(conv["user_text"])
 
-        # Collect all messages including from subsequent continuation conversations
+        # Merge stats from subsequent continuation conversations
         # This ensures long_texts from continuations appear with the original prompt
-        all_messages = list(conv["messages"])
-        for j in range(i + 1, len(conversations)):
-            if not conversations[j].get("is_continuation"):
-                break
-            all_messages.extend(conversations[j]["messages"])
-
-        # Analyze conversation for stats (excluding commits from inline display now)
-        stats = analyze_conversation(all_messages)
+        stats = merge_conversation_stats(per_conv_stats[i : group_ends[i]])
         tool_stats_str = format_tool_stats(stats.tool_counts)
 
-        long_texts_html = ""
-        for lt in stats.long_texts:
-            rendered_lt = render_markdown_text(lt)
-            long_texts_html += _macros.index_long_text(rendered_lt)
+        long_texts_html = "".join(
+            _index_long_text_html(render_markdown_text(lt)) for lt in stats.long_texts
+        )
 
-        stats_html = _macros.index_stats(tool_stats_str, long_texts_html)
+        stats_html = _index_stats_html(tool_stats_str, long_texts_html)
 
-        item_html = _macros.index_item(
+        item_html = _index_item_html(
             prompt_num, link, conv["timestamp"], rendered_content, stats_html
         )
         timeline_items.append((conv["timestamp"], "prompt", item_html))
 
     # Add commits as separate timeline items
     for commit_ts, commit_hash, commit_msg, page_num, conv_idx in all_commits:
-        item_html = _macros.index_commit(
+        item_html = _index_commit_html(
             commit_hash, commit_msg, commit_ts, rendering.get_github_repo()
         )
         timeline_items.append((commit_ts, "commit", item_html))
@@ -212,10 +417,8 @@ def _generate_html_from_data(data, output_dir, github_repo=None, echo=print):
     index_items = [item[2] for item in timeline_items]
 
     index_pagination = generate_index_pagination_html(total_pages)
-    index_template = get_template("index.html")
-    index_content = index_template.render(
-        css=CSS,
-        js=JS,
+    index_content = _INDEX_TMPL.render(
+        **assets,
         pagination_html=index_pagination,
         prompt_num=prompt_num,
         total_messages=total_messages,
@@ -231,20 +434,34 @@ def _generate_html_from_data(data, output_dir, github_repo=None, echo=print):
     )
 
 
-def generate_html(json_path, output_dir, github_repo=None):
-    """Generate HTML from a session file (JSON or JSONL)."""
-    data = parse_session_file(json_path)
+def generate_html(json_path, output_dir, github_repo=None, assets_url=None):
+    """Generate HTML from a session file (JSON or JSONL).
 
-    # Show warning if no repo detected (only for file-based generation)
-    if github_repo is None:
-        loglines = data.get("loglines", [])
-        detected = detect_github_repo(loglines)
-        if not detected:
-            print(
-                "Warning: Could not auto-detect GitHub repo. Commit links will be disabled."
-            )
+    CSS and JS are inlined into every page unless assets_url points at a
+    directory (relative to output_dir) containing styles.css and main.js.
+    """
+    json_path = Path(json_path)
+    if json_path.suffix == ".jsonl":
+        # Read the file afresh on each pass instead of holding every entry
+        def iter_entries():
+            return iter_session_entries(json_path)
+
+    else:
+        # A JSON session is a single document, so parse it just once
+        loglines = parse_session_file(json_path).get("loglines", [])
 
-    _generate_html_from_data(data, output_dir, github_repo, echo=print)
+        def iter_entries():
+            return loglines
+
+    # Show warning if no repo detected (only for file-based generation)
+    _generate_html_from_entries(
+        iter_entries,
+        output_dir,
+        github_repo,
+        echo=print,
+        warn_if_no_repo=True,
+        assets_url=assets_url,
+    )
 
 
 def generate_html_from_session_data(session_data, output_dir, github_repo=None):
@@ -253,7 +470,11 @@ def generate_html_from_session_data(session_data, output_dir, github_repo=None):
 
 
 def generate_batch_html(
-    source_folder, output_dir, include_agents=False, progress_callback=None
+    source_folder,
+    output_dir,
+    include_agents=False,
+    progress_callback=None,
+    max_workers=None,
 ):
     """Generate HTML archive for all sessions in a Claude projects folder.
 
@@ -262,18 +483,25 @@ def generate_batch_html(
     - Per-project directories with index.html listing sessions
     - Per-session directories with transcript pages
 
+    Sessions are rendered in parallel worker processes; project and master
+    indexes are generated in the calling process. CSS and JS are written
+    once to the archive root and linked from every page.
+
     Args:
         source_folder: Path to the Claude projects folder
         output_dir: Path for output archive
         include_agents: Whether to include agent-* session files
         progress_callback: Optional callback(project_name, session_name, current, total)
             called after each session is processed
+        max_workers: Number of worker processes (default: os.cpu_count()).
+            Use 1 to render every session in-process.
 
     Returns statistics dict with total_projects, total_sessions, failed_sessions, output_dir.
     """
     source_folder = Path(source_folder)
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
+    _write_assets(output_dir)
 
     # Find all sessions
     projects = find_all_sessions(source_folder, include_agents=include_agents)
@@ -284,39 +512,64 @@ def generate_batch_html(
     successful_sessions = 0
     failed_sessions = []
 
-    # Process each project
-    for project in projects:
-        project_dir = output_dir / project["name"]
-        project_dir.mkdir(exist_ok=True)
-
-        # Process each session
-        for session in project["sessions"]:
-            session_name = session["path"].stem
-            session_dir = project_dir / session_name
-
-            # Generate transcript HTML with error handling
-            try:
-                generate_html(session["path"], session_dir)
-                successful_sessions += 1
-            except Exception as e:
-                failed_sessions.append(
-                    {
-                        "project": project["name"],
-                        "session": session_name,
-                        "error": str(e),
-                    }
-                )
-
-            processed_count += 1
-
-            # Call progress callback if provided
-            if progress_callback:
-                progress_callback(
-                    project["name"], session_name, processed_count, total_session_count
-                )
-
-        # Generate project index
-        _generate_project_index(project, project_dir)
+    workers = min(max_workers or os.cpu_count() or 1, max(total_session_count, 1))
+    if sys.platform == "win32":
+        workers = min(workers, _MAX_WINDOWS_WORKERS)
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    else:
+        executor = ThreadPoolExecutor(max_workers=1)
+
+    with executor:
+        # Queue every session up front so workers stay busy across projects
+        project_futures = []
+        for project in projects:
+            project_dir = output_dir / project["name"]
+            project_dir.mkdir(exist_ok=True)
+            project_futures.append(
+                [
+                    executor.submit(
+                        generate_html,
+                        session["path"],
+                        project_dir / session["path"].stem,
+                        assets_url="../../",
+                    )
+                    for session in project["sessions"]
+                ]
+            )
+
+        # Process each project
+        for project, futures in zip(projects, project_futures):
+            project_dir = output_dir / project["name"]
+
+            # Collect each session's result with error handling
+            for session, future in zip(project["sessions"], futures):
+                session_name = session["path"].stem
+                error = future.exception()
+                if error is None:
+                    successful_sessions += 1
+                else:
+                    failed_sessions.append(
+                        {
+                            "project": project["name"],
+                            "session": session_name,
+                            "error": str(error),
+                        }
+                    )
+
+                processed_count += 1
+
+                # Call progress callback if provided
+                if progress_callback:
+                    progress_callback(
+                        project["name"],
+                        session_name,
+                        processed_count,
+                        total_session_count,
+                    )
+
+            # Generate project index
+            _generate_project_index(project, project_dir)
 
     # Generate master index
     _generate_master_index(projects, output_dir)
@@ -331,8 +584,6 @@ def generate_batch_html(
 
 def _generate_project_index(project, output_dir):
     """Generate index.html for a single project."""
-    template = get_template("project_index.html")
-
     # Format sessions for template
     sessions_data = []
     for session in project["sessions"]:
@@ -346,12 +597,11 @@ def _generate_project_index(project, output_dir):
             }
         )
 
-    html_content = template.render(
+    html_content = _PROJECT_TMPL.render(
         project_name=project["name"],
         sessions=sessions_data,
         session_count=len(sessions_data),
-        css=CSS,
-        js=JS,
+        **_asset_context("../"),
     )
 
     output_path = output_dir / "index.html"
@@ -360,8 +610,6 @@ def _generate_project_index(project, output_dir):
 
 def _generate_master_index(projects, output_dir):
     """Generate master index.html listing all projects."""
-    template = get_template("master_index.html")
-
     # Format projects for template
     projects_data = []
     total_sessions = 0
@@ -385,12 +633,11 @@ def _generate_master_index(projects, output_dir):
             }
         )
 
-    html_content = template.render(
+    html_content = _MASTER_TMPL.render(
         projects=projects_data,
         total_projects=len(projects),
         total_sessions=total_sessions,
-        css=CSS,
-        js=JS,
+        **_asset_context(""),
     )
 
     output_path = output_dir / "index.html"
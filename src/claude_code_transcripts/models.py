@@ -16,6 +16,8 @@ class ConversationStats:
     long_texts: list[str] = field(default_factory=list)
     commits: list[tuple[str, str, str]] = field(default_factory=list)
     """List of (commit_hash, commit_message, timestamp) tuples."""
+    github_repo: Optional[str] = None
+    """First GitHub repo (owner/name) seen in git push output, if any."""
 
 
 @dataclass
@@ -27,8 +29,8 @@ class Conversation:
 
     user_text: str
     timestamp: str
-    messages: list[tuple[str, str, str]] = field(default_factory=list)
-    """List of (log_type, message_json, timestamp) tuples."""
+    messages: list[tuple[str, dict, str]] = field(default_factory=list)
+    """List of (log_type, message_data, timestamp) tuples."""
     is_continuation: bool = False
     """True if this is a continuation of a previous session."""
 
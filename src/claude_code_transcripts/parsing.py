@@ -1,10 +1,44 @@
 """Session file parsing for JSON and JSONL formats."""
 
 import json
+import re
 from pathlib import Path
 
+import orjson
 
-def extract_text_from_content(content):
+
+# Halves of UTF-16 surrogate pairs, which can't be encoded as UTF-8 on their own
+_LONE_SURROGATE_PATTERN = re.compile("[\ud800-\udfff]")
+
+
+def parse_json(data):
+    """Parse JSON with orjson, falling back to json for input it rejects.
+
+    orjson is stricter than json: it refuses lone surrogate escapes (left
+    behind when tool output is cut off mid-emoji) and NaN, both of which
+    turn up in real sessions. Lone surrogates from the fallback are replaced
+    with U+FFFD so the result can still be written out as UTF-8.
+    """
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return _replace_lone_surrogates(json.loads(data))
+
+
+def _replace_lone_surrogates(obj):
+    if isinstance(obj, str):
+        return _LONE_SURROGATE_PATTERN.sub("\ufffd", obj)
+    if isinstance(obj, dict):
+        return {
+            _replace_lone_surrogates(key): _replace_lone_surrogates(value)
+            for key, value in obj.items()
+        }
+    if isinstance(obj, list):
+        return [_replace_lone_surrogates(item) for item in obj]
+    return obj
+
+
+def extract_text_from_content(content: str | list) -> str:
     """Extract plain text from message content.
 
     Handles both string content (older format) and array content (newer format).
@@ -42,8 +76,8 @@ def get_session_summary(filepath, max_length=200):
             return _get_jsonl_summary(filepath, max_length)
         else:
             # For JSON files, try to get first user message
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(filepath, "rb") as f:
+                data = parse_json(f.read())
             loglines = data.get("loglines", [])
             for entry in loglines:
                 if entry.get("type") == "user":
@@ -68,7 +102,7 @@ def _get_jsonl_summary(filepath, max_length=200):
                 if not line:
                     continue
                 try:
-                    obj = json.loads(line)
+                    obj = parse_json(line)
                     # First priority: summary type entries
                     if obj.get("type") == "summary" and obj.get("summary"):
                         summary = obj["summary"]
@@ -85,7 +119,7 @@ def _get_jsonl_summary(filepath, max_length=200):
                 if not line:
                     continue
                 try:
-                    obj = json.loads(line)
+                    obj = parse_json(line)
                     if (
                         obj.get("type") == "user"
                         and not obj.get("isMeta")
@@ -117,40 +151,57 @@ def parse_session_file(filepath):
         return _parse_jsonl_file(filepath)
     else:
         # Standard JSON format
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(filepath, "rb") as f:
+            return parse_json(f.read())
+
+
+def iter_session_entries(filepath):
+    """Yield the normalized loglines of a session file one at a time.
+
+    JSONL files are read line by line, so callers that consume entries
+    as they arrive never hold the whole session in memory at once.
+    """
+    filepath = Path(filepath)
+
+    if filepath.suffix == ".jsonl":
+        yield from _iter_jsonl_file(filepath)
+    else:
+        yield from parse_session_file(filepath).get("loglines", [])
 
 
 def _parse_jsonl_file(filepath):
     """Parse JSONL file and convert to standard format."""
-    loglines = []
+    return {"loglines": list(_iter_jsonl_file(filepath))}
 
-    with open(filepath, "r", encoding="utf-8") as f:
+
+def _iter_jsonl_file(filepath):
+    """Yield JSONL message entries converted to standard format."""
+    # Binary mode: orjson parses the raw UTF-8 bytes without a str decode
+    with open(filepath, "rb") as f:
         for line in f:
             line = line.strip()
             if not line:
                 continue
             try:
-                obj = json.loads(line)
-                entry_type = obj.get("type")
-
-                # Skip non-message entries
-                if entry_type not in ("user", "assistant"):
-                    continue
+                obj = parse_json(line)
+            except ValueError:
+                # JSONDecodeError, or UnicodeDecodeError for invalid UTF-8
+                continue
+            entry_type = obj.get("type")
 
-                # Convert to standard format
-                entry = {
-                    "type": entry_type,
-                    "timestamp": obj.get("timestamp", ""),
-                    "message": obj.get("message", {}),
-                }
+            # Skip non-message entries
+            if entry_type not in ("user", "assistant"):
+                continue
 
-                # Preserve isCompactSummary if present
-                if obj.get("isCompactSummary"):
-                    entry["isCompactSummary"] = True
+            # Convert to standard format
+            entry = {
+                "type": entry_type,
+                "timestamp": obj.get("timestamp", ""),
+                "message": obj.get("message", {}),
+            }
 
-                loglines.append(entry)
-            except json.JSONDecodeError:
-                continue
+            # Preserve isCompactSummary if present
+            if obj.get("isCompactSummary"):
+                entry["isCompactSummary"] = True
 
-    return {"loglines": loglines}
+            yield entry
@@ -2,8 +2,12 @@
 
 import html
 import json
+from functools import lru_cache
 
 import markdown
+from markupsafe import Markup
+
+from .parsing import parse_json
 
 
 # Module state - initialized by init()
@@ -38,14 +42,17 @@ def get_github_repo():
 def format_json(obj):
     try:
         if isinstance(obj, str):
-            obj = json.loads(obj)
+            obj = parse_json(obj)
         formatted = json.dumps(obj, indent=2, ensure_ascii=False)
         return f'<pre class="json">{html.escape(formatted)}</pre>'
     except (json.JSONDecodeError, TypeError):
         return f"<pre>{html.escape(str(obj))}</pre>"
 
 
+@lru_cache(maxsize=4096)
 def render_markdown_text(text):
+    # Cached: the same prompts, hook feedback and summaries recur across
+    # sessions, and the returned str is immutable so sharing it is safe.
     if not text:
         return ""
     return markdown.markdown(text, extensions=["fenced_code", "tables"])
@@ -197,13 +204,9 @@ def is_tool_result_message(message_data):
     )
 
 
-def render_message(log_type, message_json, timestamp):
-    if not message_json:
-        return ""
-    try:
-        message_data = json.loads(message_json)
-    except json.JSONDecodeError:
-        return ""
+def render_message(log_type, message_data, timestamp):
+    if not message_data:
+        return Markup("")
     if log_type == "user":
         content_html = render_user_message_content(message_data)
         # Check if this is a tool result message
@@ -215,8 +218,8 @@ def render_message(log_type, message_json, timestamp):
         content_html = render_assistant_message(message_data)
         role_class, role_label = "assistant", "Assistant"
     else:
-        return ""
+        return Markup("")
     if not content_html.strip():
-        return ""
+        return Markup("")
     msg_id = make_msg_id(timestamp)
     return _macros.message(role_class, role_label, msg_id, timestamp, content_html)
@@ -0,0 +1,30 @@
+"""Shared Jinja2 environment for the transcript templates."""
+
+from jinja2 import Environment, FileSystemBytecodeCache, PackageLoader
+
+
+def _bytecode_cache():
+    """Cache compiled templates across runs in Jinja's per-user temp dir.
+
+    Jinja checks each entry against the template source, so upgrades are
+    picked up automatically. Returns None (compile every run) if no safe
+    cache directory is available.
+    """
+    try:
+        return FileSystemBytecodeCache(pattern="__claude_code_transcripts_%s.cache")
+    except (OSError, RuntimeError):
+        return None
+
+
+# Set up Jinja2 environment. Templates ship with the package and never change
+# at runtime, so skip the uptodate checks and keep every compiled template.
+jinja_env = Environment(
+    loader=PackageLoader("claude_code_transcripts", "templates"),
+    autoescape=True,
+    auto_reload=False,
+    cache_size=-1,
+    bytecode_cache=_bytecode_cache(),
+)
+
+# Load macros template and expose macros
+macros = jinja_env.get_template("macros.html").module
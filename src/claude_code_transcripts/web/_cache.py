@@ -0,0 +1,280 @@
+"""In-memory caches for session discovery and rendering in the web interface."""
+
+import asyncio
+import gzip
+import hashlib
+import importlib.metadata
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import orjson
+from markupsafe import Markup
+from starlette.concurrency import run_in_threadpool
+
+from ..discovery import find_all_sessions
+from ..rendering import get_github_repo, render_message
+
+# (root mtime, sorted (project folder, mtime) pairs), or None if missing
+Signature = tuple[int, tuple[tuple[str, int], ...]] | None
+
+# (log type, message digest, timestamp, github repo) -> rendered HTML
+_rendered_cache: OrderedDict[tuple[str, bytes, str, str | None], Markup] = OrderedDict()
+# Messages are rendered from threadpool workers, so guard the LRU bookkeeping
+_rendered_lock = threading.Lock()
+RENDERED_CACHE_SIZE = 4096
+
+
+def _projects_signature(projects_dir) -> Signature:
+    """Cheap fingerprint of the projects tree: mtimes of it and its folders.
+
+    Adding or removing a session file changes its project folder's mtime, and
+    adding a project changes the root's, so this changes whenever
+    find_all_sessions would return a different set of sessions.
+    """
+    try:
+        with os.scandir(projects_dir) as entries:
+            folders = tuple(
+                sorted(
+                    (entry.name, entry.stat().st_mtime_ns)
+                    for entry in entries
+                    if entry.is_dir()
+                )
+            )
+        return os.stat(projects_dir).st_mtime_ns, folders
+    except FileNotFoundError:
+        return None
+
+
+def _build_index(projects):
+    """Index find_all_sessions output by project name and session file stem."""
+    by_name = {}
+    sessions_by_name = {}
+    for project in projects:
+        # Keep the first match, as a linear scan over the list would
+        if project["name"] in by_name:
+            continue
+        by_name[project["name"]] = project
+        sessions = {}
+        for session in project["sessions"]:
+            sessions.setdefault(session["path"].stem, session)
+        sessions_by_name[project["name"]] = sessions
+    return {
+        "projects": projects,
+        "by_name": by_name,
+        "sessions_by_name": sessions_by_name,
+    }
+
+
+class SessionsCache:
+    """find_all_sessions results for one projects directory, reused briefly.
+
+    Each app builds its own, so nothing is shared between apps or event
+    loops.
+    """
+
+    def __init__(self, projects_dir, ttl=2.0) -> None:
+        self.projects_dir = projects_dir
+        self.ttl = ttl
+        # (monotonic time computed, tree signature, index), once computed
+        self._entry: tuple[float, Signature, dict] | None = None
+        # Serializes recomputes so a burst of requests triggers a single walk
+        self._lock: asyncio.Lock | None = None
+        self._lock_loop: asyncio.AbstractEventLoop | None = None
+
+    def _lookup(self, signature):
+        if self._entry is None:
+            return None
+        computed_at, cached_signature, index = self._entry
+        if cached_signature != signature:
+            return None
+        if time.monotonic() - computed_at >= self.ttl:
+            return None
+        return index
+
+    def _get_lock(self):
+        # An asyncio.Lock can only be waited on from one event loop, and test
+        # clients may run each request in a fresh one
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    async def get(self):
+        """Return an index of find_all_sessions(projects_dir).
+
+        The index is a dict with the "projects" list itself, "by_name"
+        mapping project names to projects, and "sessions_by_name" mapping
+        project names to {session file stem: session}.
+
+        The cached index is reused while the projects tree is unchanged and
+        it is less than ttl seconds old; the TTL bounds how long appends to
+        existing session files (which change no directory mtime) can go
+        unnoticed.
+        """
+        signature = _projects_signature(self.projects_dir)
+        index = self._lookup(signature)
+        if index is not None:
+            return index
+
+        async with self._get_lock():
+            # Another request may have refreshed the cache while we waited
+            index = self._lookup(signature)
+            if index is None:
+                # Walking the tree blocks, so keep it off the event loop
+                projects = await run_in_threadpool(find_all_sessions, self.projects_dir)
+                index = _build_index(projects)
+                self._entry = (time.monotonic(), signature, index)
+        return index
+
+
+def render_message_cached(log_type, message_data, timestamp):
+    """render_message, memoized on a digest of the message contents.
+
+    Session files are append-only, so re-viewing a session renders each
+    message from cache; only the hashing of its JSON encoding is repeated.
+    """
+    digest = hashlib.blake2b(orjson.dumps(message_data), digest_size=16).digest()
+    key = (log_type, digest, timestamp, get_github_repo())
+    with _rendered_lock:
+        html = _rendered_cache.get(key)
+        if html is not None:
+            _rendered_cache.move_to_end(key)
+            return html
+
+    html = render_message(log_type, message_data, timestamp)
+    with _rendered_lock:
+        _rendered_cache[key] = html
+        if len(_rendered_cache) > RENDERED_CACHE_SIZE:
+            _rendered_cache.popitem(last=False)
+    return html
+
+
+def _render_version():
+    """Identify the code that renders session pages.
+
+    Combines the package version with a digest of the session page templates,
+    the message macros and the rendering module, so pages cached by other
+    code, including edits made while developing, are never served.
+    """
+    try:
+        version = importlib.metadata.version("claude-code-transcripts")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+    package_dir = Path(__file__).parent.parent
+    sources = [
+        package_dir / "templates" / "macros.html",
+        package_dir / "rendering.py",
+        *sorted((package_dir / "web" / "templates").glob("*.html")),
+    ]
+    digest = hashlib.blake2b(digest_size=6)
+    for source in sources:
+        digest.update(source.read_bytes())
+    return f"{version}-{digest.hexdigest()}"
+
+
+RENDER_VERSION = _render_version()
+
+
+def session_etag(source_stat, representation="html"):
+    """Weak ETag for one representation of a session file's state.
+
+    Session files only change by being appended to, so their mtime and size
+    identify their contents; the size catches appends that land within the
+    same mtime tick. Each representation (HTML or msgpack) gets its own tag
+    so a cached copy of one never validates the other.
+    """
+    return (
+        f'W/"{RENDER_VERSION}-{source_stat.st_mtime_ns}-{source_stat.st_size}'
+        f'-{representation}"'
+    )
+
+
+def rendered_page_path(cache_dir, session_path, source_stat):
+    """Path of a session's rendered page, for this code and file state.
+
+    Pages live under cache_dir/pages/<render version>/<project folder>/
+    <session>/, named after the session file's mtime and size, so a page
+    exists at this path only if it is current.
+    """
+    return (
+        cache_dir
+        / "pages"
+        / RENDER_VERSION
+        / session_path.parent.name
+        / session_path.stem
+        / f"{source_stat.st_mtime_ns}-{source_stat.st_size}.html"
+    )
+
+
+def compressed_page_path(page_path):
+    """Path of the gzipped copy stored next to a rendered page."""
+    return page_path.with_name(page_path.name + ".gz")
+
+
+def prune_rendered_pages(cache_dir, projects_dir):
+    """Delete cached pages from other code versions or for deleted sessions."""
+    pages_dir = cache_dir / "pages"
+    if not pages_dir.is_dir():
+        return
+    for version_dir in pages_dir.iterdir():
+        if version_dir.is_dir() and version_dir.name != RENDER_VERSION:
+            shutil.rmtree(version_dir, ignore_errors=True)
+    current_dir = pages_dir / RENDER_VERSION
+    if not current_dir.is_dir():
+        return
+    sessions = {
+        (path.parent.name, path.stem) for path in Path(projects_dir).glob("**/*.jsonl")
+    }
+    # Skip stray files such as .DS_Store at either level
+    for project_dir in current_dir.iterdir():
+        if not project_dir.is_dir():
+            continue
+        for session_dir in project_dir.iterdir():
+            key = (project_dir.name, session_dir.name)
+            if session_dir.is_dir() and key not in sessions:
+                shutil.rmtree(session_dir, ignore_errors=True)
+
+
+def write_through(chunks, page_path):
+    """Yield chunks of a rendered page while saving them to page_path.
+
+    A gzipped copy is written alongside so compressed responses can be sent
+    without recompressing. Both are written to temporary files and only
+    renamed into place once every chunk has been produced, so readers never
+    see a partial page. Pages for earlier states of the session are then
+    removed.
+    """
+    page_path.parent.mkdir(parents=True, exist_ok=True)
+    targets = [page_path, compressed_page_path(page_path)]
+    tmp_names = []
+    try:
+        for _ in targets:
+            fd, tmp_name = tempfile.mkstemp(dir=page_path.parent, suffix=".tmp")
+            os.close(fd)
+            tmp_names.append(tmp_name)
+        with (
+            open(tmp_names[0], "wb") as f,
+            gzip.GzipFile(tmp_names[1], "wb", compresslevel=6, mtime=0) as gz,
+        ):
+            for chunk in chunks:
+                data = chunk.encode("utf-8")
+                f.write(data)
+                gz.write(data)
+                yield chunk
+        for tmp_name, target in zip(tmp_names, targets):
+            os.replace(tmp_name, target)
+    except BaseException:
+        for tmp_name in tmp_names:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+        raise
+
+    for stale in page_path.parent.glob("*.html*"):
+        if stale not in targets:
+            stale.unlink(missing_ok=True)
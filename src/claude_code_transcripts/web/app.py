@@ -3,18 +3,25 @@
 from pathlib import Path
 
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemLoader
 
-from .routes import router
+from ._cache import prune_rendered_pages
+from .routes import build_router
 
 
-def create_app(projects_dir: Path | None = None) -> FastAPI:
+def create_app(
+    projects_dir: Path | None = None, cache_dir: Path | None = None
+) -> FastAPI:
     """Create and configure the FastAPI application.
 
     Args:
         projects_dir: Path to Claude projects directory.
                      Defaults to ~/.claude/projects
+        cache_dir: Directory for rendered session pages, which are served
+                   from disk until their session changes. Disabled if None.
     """
     if projects_dir is None:
         projects_dir = Path.home() / ".claude" / "projects"
@@ -24,15 +31,36 @@ def create_app(projects_dir: Path | None = None) -> FastAPI:
         description="Browse and search Claude Code conversation transcripts",
     )
 
-    # Store projects_dir in app state for routes to access
+    # Store settings in app state for anything else that needs them
     app.state.projects_dir = projects_dir
+    app.state.cache_dir = cache_dir
+    if cache_dir is not None:
+        prune_rendered_pages(cache_dir, projects_dir)
 
-    # Set up Jinja2 templates
+    # Set up Jinja2 templates; they ship with the package, so never recheck
+    # them for changes
     templates_dir = Path(__file__).parent / "templates"
-    templates = Jinja2Templates(directory=str(templates_dir))
+    templates = Jinja2Templates(
+        env=Environment(
+            loader=FileSystemLoader(str(templates_dir)),
+            autoescape=True,
+            auto_reload=False,
+            cache_size=400,
+        )
+    )
     app.state.templates = templates
 
-    # Include routes
+    # Transcript HTML is highly repetitive and compresses very well
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+    # Include routes, with page templates resolved once up front
+    router = build_router(
+        projects_dir,
+        tpl_projects=templates.env.get_template("projects.html"),
+        tpl_sessions=templates.env.get_template("sessions.html"),
+        tpl_session=templates.env.get_template("session.html"),
+        cache_dir=cache_dir,
+    )
     app.include_router(router)
 
     return app
@@ -1,101 +1,198 @@
 """Route handlers for the web interface."""
 
-import json
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
+import msgpack  # type: ignore[import-untyped]
 from fastapi import APIRouter, Request, HTTPException
-from fastapi.responses import HTMLResponse
-from markupsafe import Markup
+from fastapi.responses import (
+    FileResponse,
+    HTMLResponse,
+    Response,
+    StreamingResponse,
+)
+from starlette.concurrency import run_in_threadpool
 
-from ..discovery import find_all_sessions
 from ..parsing import parse_session_file
-from ..rendering import render_message
-
-router = APIRouter()
-
-
-@router.get("/", response_class=HTMLResponse)
-async def index(request: Request):
-    """List all projects with their sessions."""
-    projects_dir = request.app.state.projects_dir
-    templates = request.app.state.templates
-
-    projects = find_all_sessions(projects_dir)
-
-    return templates.TemplateResponse(
-        request,
-        "projects.html",
-        {
-            "projects": projects,
-            "projects_dir": projects_dir,
-        },
-    )
-
-
-@router.get("/project/{project_name}", response_class=HTMLResponse)
-async def project_sessions(request: Request, project_name: str):
-    """List all sessions in a project."""
-    projects_dir = request.app.state.projects_dir
-    templates = request.app.state.templates
-
-    projects = find_all_sessions(projects_dir)
-
-    # Find the requested project
-    project = next((p for p in projects if p["name"] == project_name), None)
-    if project is None:
-        raise HTTPException(status_code=404, detail=f"Project '{project_name}' not found")
-
-    return templates.TemplateResponse(
-        request,
-        "sessions.html",
-        {
-            "project": project,
-        },
-    )
-
-
-@router.get("/session/{project_name}/{session_id}", response_class=HTMLResponse)
-async def view_session(request: Request, project_name: str, session_id: str):
-    """View a single session's conversation."""
-    projects_dir = request.app.state.projects_dir
-    templates = request.app.state.templates
-
-    projects = find_all_sessions(projects_dir)
-
-    # Find the requested project
-    project = next((p for p in projects if p["name"] == project_name), None)
-    if project is None:
-        raise HTTPException(status_code=404, detail=f"Project '{project_name}' not found")
-
-    # Find the requested session
-    session = next(
-        (s for s in project["sessions"] if s["path"].stem == session_id),
-        None
-    )
-    if session is None:
-        raise HTTPException(status_code=404, detail=f"Session '{session_id}' not found")
-
-    # Parse the session file
-    session_data = parse_session_file(session["path"])
-
-    # Render messages
-    rendered_messages = []
-    for logline in session_data.get("loglines", []):
-        msg_type = logline.get("type")
-        if msg_type in ("user", "assistant"):
-            message_json = json.dumps(logline.get("message", {}))
-            timestamp = logline.get("timestamp", "")
-            html = render_message(msg_type, message_json, timestamp)
-            rendered_messages.append({
-                "type": msg_type,
-                "html": Markup(html),
-            })
-
-    return templates.TemplateResponse(
-        request,
-        "session.html",
-        {
-            "project": project,
-            "session": session,
-            "messages": rendered_messages,
-        },
-    )
+from ._cache import (
+    SessionsCache,
+    compressed_page_path,
+    render_message_cached,
+    rendered_page_path,
+    session_etag,
+    write_through,
+)
+
+# Template events buffered per chunk when streaming a session page
+_STREAM_BUFFER_SIZE = 32
+
+# Messages rendered per task when rendering a session page in parallel
+_RENDER_CHUNK_SIZE = 32
+
+# Chunks of one session page rendered ahead of what has been sent
+_RENDER_WINDOW = os.cpu_count() or 1
+
+_render_pool = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1, thread_name_prefix="render-messages"
+)
+
+
+def _render_chunk(loglines):
+    """Render a slice of a session's user and assistant loglines."""
+    render = render_message_cached
+    rendered = []
+    for logline in loglines:
+        get = logline.get
+        msg_type = get("type")
+        # render_message output is already Markup
+        html = render(msg_type, get("message", {}), get("timestamp", ""))
+        rendered.append({"type": msg_type, "html": html})
+    return rendered
+
+
+def _render(template, context):
+    """Render a pre-resolved template into an HTML response."""
+    return HTMLResponse(template.render(context))
+
+
+def build_router(projects_dir, tpl_projects, tpl_sessions, tpl_session, cache_dir=None):
+    """Build the web routes around the given projects directory and templates.
+
+    The handlers close over these objects rather than reading them from
+    app.state on every request.
+    """
+    router = APIRouter()
+    sessions = SessionsCache(projects_dir)
+
+    @router.get("/", response_class=HTMLResponse)
+    async def index():
+        """List all projects with their sessions."""
+        index = await sessions.get()
+
+        return _render(
+            tpl_projects,
+            {
+                "projects": index["projects"],
+                "projects_dir": projects_dir,
+            },
+        )
+
+    @router.get("/project/{project_name}", response_class=HTMLResponse)
+    async def project_sessions(project_name: str):
+        """List all sessions in a project."""
+        index = await sessions.get()
+
+        # Find the requested project
+        project = index["by_name"].get(project_name)
+        if project is None:
+            raise HTTPException(
+                status_code=404, detail=f"Project '{project_name}' not found"
+            )
+
+        return _render(
+            tpl_sessions,
+            {
+                "project": project,
+            },
+        )
+
+    @router.get("/session/{project_name}/{session_id}", response_class=HTMLResponse)
+    async def view_session(request: Request, project_name: str, session_id: str):
+        """View a single session's conversation."""
+        index = await sessions.get()
+
+        # Find the requested project
+        project = index["by_name"].get(project_name)
+        if project is None:
+            raise HTTPException(
+                status_code=404, detail=f"Project '{project_name}' not found"
+            )
+
+        # Find the requested session
+        session = index["sessions_by_name"][project_name].get(session_id)
+        if session is None:
+            raise HTTPException(
+                status_code=404, detail=f"Session '{session_id}' not found"
+            )
+
+        # Programmatic clients can ask for the parsed loglines instead of HTML
+        wants_msgpack = "application/x-msgpack" in request.headers.get("accept", "")
+        source_stat = session["path"].stat()
+        etag = session_etag(source_stat, "msgpack" if wants_msgpack else "html")
+        headers = {"ETag": etag, "Vary": "Accept"}
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            return Response(status_code=304, headers=headers)
+
+        if wants_msgpack:
+            session_data = await run_in_threadpool(parse_session_file, session["path"])
+            return Response(
+                content=msgpack.packb(session_data.get("loglines", [])),
+                media_type="application/x-msgpack",
+                headers=headers,
+            )
+
+        if cache_dir is not None:
+            page_path = rendered_page_path(cache_dir, session["path"], source_stat)
+            if page_path.is_file():
+                gzip_path = compressed_page_path(page_path)
+                accepts_gzip = "gzip" in request.headers.get("accept-encoding", "")
+                if accepts_gzip and gzip_path.is_file():
+                    # Already compressed, so GZipMiddleware passes it through
+                    return FileResponse(
+                        gzip_path,
+                        media_type="text/html",
+                        headers={
+                            **headers,
+                            "Content-Encoding": "gzip",
+                            "Vary": "Accept, Accept-Encoding",
+                        },
+                    )
+                return FileResponse(page_path, media_type="text/html", headers=headers)
+
+        # Parse the session file
+        session_data = await run_in_threadpool(parse_session_file, session["path"])
+
+        # Render chunks of messages in parallel, yielding them in order. Only
+        # a window of chunks is in flight, so rendering keeps pace with a
+        # slow client rather than buffering the whole page, and one long
+        # session doesn't queue its every chunk ahead of other requests.
+        def rendered_messages():
+            renderable = [
+                logline
+                for logline in session_data.get("loglines", ())
+                if logline.get("type") in ("user", "assistant")
+            ]
+            chunks = (
+                renderable[i : i + _RENDER_CHUNK_SIZE]
+                for i in range(0, len(renderable), _RENDER_CHUNK_SIZE)
+            )
+            pending = deque(
+                _render_pool.submit(_render_chunk, chunk)
+                for chunk in islice(chunks, _RENDER_WINDOW)
+            )
+            try:
+                while pending:
+                    rendered = pending.popleft().result()
+                    for chunk in islice(chunks, 1):
+                        pending.append(_render_pool.submit(_render_chunk, chunk))
+                    yield from rendered
+            finally:
+                # The client went away; drop chunks nobody will read
+                for future in pending:
+                    future.cancel()
+
+        stream = tpl_session.stream(
+            project=project,
+            session=session,
+            messages=rendered_messages(),
+        )
+        # Send a few messages per chunk rather than one write per template event
+        stream.enable_buffering(_STREAM_BUFFER_SIZE)
+        if cache_dir is not None:
+            stream = write_through(stream, page_path)
+        return StreamingResponse(stream, media_type="text/html", headers=headers)
+
+    return router
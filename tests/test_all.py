@@ -161,6 +161,47 @@ class TestFindAllSessions:
             assert "summary" in session
             assert session["summary"] != "(no summary)"
 
+    def test_summaries_reread_only_for_changed_files(
+        self, mock_projects_dir, monkeypatch
+    ):
+        """Test that unchanged session files are not read again."""
+        from claude_code_transcripts import discovery
+
+        calls = []
+        original = discovery.get_session_summary
+
+        def counting_get_session_summary(path):
+            calls.append(path)
+            return original(path)
+
+        monkeypatch.setattr(
+            discovery, "get_session_summary", counting_get_session_summary
+        )
+        find_all_sessions(mock_projects_dir)
+        first_reads = len(calls)
+        assert first_reads > 0
+
+        find_all_sessions(mock_projects_dir)
+        assert len(calls) == first_reads
+
+        changed = mock_projects_dir / "-home-user-projects-project-a" / "abc123.jsonl"
+        with open(changed, "a") as f:
+            f.write("\n")
+        find_all_sessions(mock_projects_dir)
+        assert calls[first_reads:] == [changed]
+
+    def test_summaries_of_deleted_files_are_dropped(self, mock_projects_dir):
+        """Test that the summary cache only keeps files from the latest walk."""
+        from claude_code_transcripts import discovery
+
+        deleted = mock_projects_dir / "-home-user-projects-project-a" / "abc123.jsonl"
+        find_all_sessions(mock_projects_dir)
+        assert deleted in discovery._summary_cache[mock_projects_dir]
+
+        deleted.unlink()
+        find_all_sessions(mock_projects_dir)
+        assert deleted not in discovery._summary_cache[mock_projects_dir]
+
 
 class TestGenerateBatchHtml:
     """Tests for generate_batch_html function."""
@@ -228,6 +269,29 @@ class TestGenerateBatchHtml:
         assert "abc123" in project_a_index
         assert "def456" in project_a_index
 
+    def test_links_shared_assets(self, mock_projects_dir, output_dir):
+        """Test that CSS/JS are written once and linked rather than inlined."""
+        from claude_code_transcripts import CSS
+
+        generate_batch_html(mock_projects_dir, output_dir)
+
+        assert (output_dir / "styles.css").read_text(encoding="utf-8") == CSS
+        assert (output_dir / "main.js").exists()
+
+        master_html = (output_dir / "index.html").read_text(encoding="utf-8")
+        assert '<link rel="stylesheet" href="styles.css">' in master_html
+        project_html = (output_dir / "project-a" / "index.html").read_text(
+            encoding="utf-8"
+        )
+        assert '<link rel="stylesheet" href="../styles.css">' in project_html
+
+        session_dir = output_dir / "project-a" / "abc123"
+        for page in ("index.html", "page-001.html"):
+            page_html = (session_dir / page).read_text(encoding="utf-8")
+            assert '<link rel="stylesheet" href="../../styles.css">' in page_html
+            assert '<script src="../../main.js"></script>' in page_html
+            assert "<style>" not in page_html
+
     def test_returns_statistics(self, mock_projects_dir, output_dir):
         """Test that batch generation returns statistics."""
         stats = generate_batch_html(mock_projects_dir, output_dir)
@@ -281,15 +345,20 @@ class TestGenerateBatchHtml:
             from claude_code_transcripts import html_generation
             original_generate_html = html_generation.generate_html
 
-            def mock_generate_html(json_path, output_dir, github_repo=None):
+            def mock_generate_html(
+                json_path, output_dir, github_repo=None, assets_url=None
+            ):
                 if "session1" in str(json_path):
                     raise RuntimeError("Simulated failure")
-                return original_generate_html(json_path, output_dir, github_repo)
+                return original_generate_html(
+                    json_path, output_dir, github_repo, assets_url
+                )
 
+            # The patch only applies in-process, so render without worker processes
             with patch(
                 "claude_code_transcripts.html_generation.generate_html", side_effect=mock_generate_html
             ):
-                stats = generate_batch_html(projects_dir, output_dir)
+                stats = generate_batch_html(projects_dir, output_dir, max_workers=1)
 
             # Should have processed session2 successfully
             assert stats["total_sessions"] == 1
@@ -297,3 +366,45 @@ class TestGenerateBatchHtml:
             assert len(stats["failed_sessions"]) == 1
             assert "session1" in stats["failed_sessions"][0]["session"]
             assert "Simulated failure" in stats["failed_sessions"][0]["error"]
+
+    def test_worker_count_is_capped_on_windows(
+        self, mock_projects_dir, output_dir, monkeypatch
+    ):
+        """Test that Windows never gets more workers than it supports."""
+        from claude_code_transcripts import html_generation
+
+        pool_sizes = []
+
+        def recording_pool(max_workers):
+            pool_sizes.append(max_workers)
+            return html_generation.ThreadPoolExecutor(max_workers=1)
+
+        monkeypatch.setattr(html_generation.sys, "platform", "win32")
+        monkeypatch.setattr(html_generation, "ProcessPoolExecutor", recording_pool)
+        monkeypatch.setattr(html_generation, "_MAX_WINDOWS_WORKERS", 2)
+        generate_batch_html(mock_projects_dir, output_dir, max_workers=64)
+        assert pool_sizes == [2]
+
+    def test_records_failures_from_worker_processes(self, output_dir):
+        """Test that errors raised in worker processes are reported."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            projects_dir = Path(tmpdir)
+            project = projects_dir / "-home-user-projects-test"
+            project.mkdir(parents=True)
+            for name in ("session1", "session2"):
+                (project / f"{name}.jsonl").write_text(
+                    '{"type": "user", "timestamp": "2025-01-01T10:00:00.000Z", "message": {"role": "user", "content": "Hello from '
+                    + name
+                    + '"}}\n'
+                )
+
+            # A file where the session directory should go makes session1 fail
+            (output_dir / "test").mkdir()
+            (output_dir / "test" / "session1").write_text("not a directory")
+
+            stats = generate_batch_html(projects_dir, output_dir, max_workers=2)
+
+            assert stats["total_sessions"] == 1
+            assert len(stats["failed_sessions"]) == 1
+            assert stats["failed_sessions"][0]["session"] == "session1"
+            assert (output_dir / "test" / "session2" / "index.html").exists()
@@ -5,6 +5,7 @@ import tempfile
 from pathlib import Path
 
 import pytest
+from markupsafe import Markup
 from syrupy.extensions.single_file import SingleFileSnapshotExtension, WriteMode
 
 from claude_code_transcripts import (
@@ -19,12 +20,15 @@ from claude_code_transcripts import (
     render_bash_tool,
     render_content_block,
     analyze_conversation,
+    merge_conversation_stats,
     format_tool_stats,
     is_tool_result_message,
+    render_message,
     inject_gist_preview_js,
     create_gist,
     GIST_PREVIEW_JS,
     parse_session_file,
+    iter_session_entries,
     get_session_summary,
     find_local_sessions,
 )
@@ -91,6 +95,31 @@ class TestGenerateHtml:
         repo = detect_github_repo(loglines)
         assert repo == "example/project"
 
+    def test_generate_html_autodetects_repo(self, output_dir, capsys):
+        """Test that generate_html detects the repo during conversation analysis."""
+        fixture_path = Path(__file__).parent / "sample_session.json"
+        generate_html(fixture_path, output_dir)
+
+        output = capsys.readouterr().out
+        assert "Auto-detected GitHub repo: example/project" in output
+        assert "Could not auto-detect" not in output
+        index_html = (output_dir / "index.html").read_text(encoding="utf-8")
+        assert "https://github.com/example/project/commit/" in index_html
+
+    def test_repo_detected_from_push_before_first_prompt(self, tmp_path, capsys):
+        """Test that push output logged before the first prompt is still used."""
+        jsonl_file = tmp_path / "session.jsonl"
+        jsonl_file.write_text(
+            '{"type":"assistant","message":{"role":"assistant","content":[{"type":"tool_use","id":"t1","name":"Bash","input":{"command":"git push"}}]}}\n'
+            '{"type":"user","message":{"role":"user","content":[{"type":"tool_result","tool_use_id":"t1","content":"remote: https://github.com/own/rep/pull/new/b"}]}}\n'
+            '{"type":"user","message":{"role":"user","content":"hello"}}\n'
+        )
+
+        generate_html(jsonl_file, tmp_path / "output")
+
+        output = capsys.readouterr().out
+        assert "Auto-detected GitHub repo: own/rep" in output
+
     def test_handles_array_content_format(self, tmp_path):
         """Test that user messages with array content format are recognized.
 
@@ -117,6 +146,55 @@ class TestGenerateHtml:
         # The page file should exist
         assert (output_dir / "page-001.html").exists()
 
+    def test_jsonl_pages_match_json(self, tmp_path):
+        """Test that a streamed JSONL session renders like the same JSON session."""
+        lines = [
+            f'{{"type":"user","timestamp":"2025-01-01T10:{i:02d}:00.000Z","message":{{"role":"user","content":"Prompt {i}"}}}}'
+            for i in range(12)
+        ]
+        jsonl_file = tmp_path / "session.jsonl"
+        jsonl_file.write_text("\n".join(lines) + "\n")
+        json_file = tmp_path / "session.json"
+        json_file.write_text('{"loglines": [%s]}' % ",".join(lines))
+
+        generate_html(jsonl_file, tmp_path / "from_jsonl")
+        generate_html(json_file, tmp_path / "from_json")
+
+        for name in ("index.html", "page-001.html", "page-002.html", "page-003.html"):
+            assert (tmp_path / "from_jsonl" / name).read_text() == (
+                tmp_path / "from_json" / name
+            ).read_text()
+        assert not (tmp_path / "from_jsonl" / "page-004.html").exists()
+
+    def test_missing_session_creates_no_output(self, tmp_path):
+        """Test that a session that can't be read leaves no output directory."""
+        output_dir = tmp_path / "output"
+        with pytest.raises(FileNotFoundError):
+            generate_html(tmp_path / "missing.jsonl", output_dir)
+        assert not output_dir.exists()
+
+
+class TestSyntheticPrompts:
+    """Tests for leaving injected user messages out of the index."""
+
+    def test_synthetic_prompts_not_listed_in_index(self, tmp_path):
+        """Test that hook feedback, slash commands and caveats are skipped."""
+        jsonl_file = tmp_path / "session.jsonl"
+        jsonl_file.write_text(
+            '{"type":"user","timestamp":"2025-01-01T10:00:00.000Z","message":{"role":"user","content":"Real question"}}\n'
+            '{"type":"user","timestamp":"2025-01-01T10:01:00.000Z","message":{"role":"user","content":"Caveat: The messages below were generated by the user"}}\n'
+            '{"type":"user","timestamp":"2025-01-01T10:02:00.000Z","message":{"role":"user","content":"<command-name>/clear</command-name>"}}\n'
+            '{"type":"user","timestamp":"2025-01-01T10:03:00.000Z","message":{"role":"user","content":"Stop hook feedback: keep going"}}\n'
+        )
+        output_dir = tmp_path / "output"
+        generate_html(jsonl_file, output_dir)
+
+        index_html = (output_dir / "index.html").read_text(encoding="utf-8")
+        assert "Real question" in index_html
+        assert "1 prompts" in index_html
+        assert "Caveat:" not in index_html
+        assert "Stop hook feedback" not in index_html
+
 
 class TestRenderFunctions:
     """Tests for individual render functions."""
@@ -311,30 +389,28 @@ class TestAnalyzeConversation:
         messages = [
             (
                 "assistant",
-                json.dumps(
-                    {
-                        "content": [
-                            {
-                                "type": "tool_use",
-                                "name": "Bash",
-                                "id": "1",
-                                "input": {},
-                            },
-                            {
-                                "type": "tool_use",
-                                "name": "Bash",
-                                "id": "2",
-                                "input": {},
-                            },
-                            {
-                                "type": "tool_use",
-                                "name": "Write",
-                                "id": "3",
-                                "input": {},
-                            },
-                        ]
-                    }
-                ),
+                {
+                    "content": [
+                        {
+                            "type": "tool_use",
+                            "name": "Bash",
+                            "id": "1",
+                            "input": {},
+                        },
+                        {
+                            "type": "tool_use",
+                            "name": "Bash",
+                            "id": "2",
+                            "input": {},
+                        },
+                        {
+                            "type": "tool_use",
+                            "name": "Write",
+                            "id": "3",
+                            "input": {},
+                        },
+                    ]
+                },
                 "2025-01-01T00:00:00Z",
             ),
         ]
@@ -347,16 +423,14 @@ class TestAnalyzeConversation:
         messages = [
             (
                 "user",
-                json.dumps(
-                    {
-                        "content": [
-                            {
-                                "type": "tool_result",
-                                "content": "[main abc1234] Add new feature\n 1 file changed",
-                            }
-                        ]
-                    }
-                ),
+                {
+                    "content": [
+                        {
+                            "type": "tool_result",
+                            "content": "[main abc1234] Add new feature\n 1 file changed",
+                        }
+                    ]
+                },
                 "2025-01-01T00:00:00Z",
             ),
         ]
@@ -365,6 +439,71 @@ class TestAnalyzeConversation:
         assert result.commits[0][0] == "abc1234"
         assert "Add new feature" in result.commits[0][1]
 
+    def test_detects_github_repo(self):
+        """Test that the first GitHub repo from git push output is reported."""
+        messages = [
+            (
+                "user",
+                {
+                    "content": [
+                        {
+                            "type": "tool_result",
+                            "content": "remote: https://github.com/owner/repo/pull/new/branch",
+                        },
+                        {
+                            "type": "tool_result",
+                            "content": "remote: https://github.com/other/repo/pull/new/branch",
+                        },
+                    ]
+                },
+                "2025-01-01T00:00:00Z",
+            ),
+        ]
+        assert analyze_conversation(messages).github_repo == "owner/repo"
+
+    def test_merge_matches_combined_analysis(self):
+        """Test that merged stats equal analyzing the messages together."""
+        first = [
+            (
+                "assistant",
+                {
+                    "content": [
+                        {"type": "tool_use", "name": "Bash", "id": "1", "input": {}},
+                        {"type": "text", "text": "a" * 300},
+                    ]
+                },
+                "2025-01-01T00:00:00Z",
+            ),
+        ]
+        second = [
+            (
+                "user",
+                {
+                    "content": [
+                        {
+                            "type": "tool_result",
+                            "content": "[main abc1234] Add new feature",
+                        }
+                    ]
+                },
+                "2025-01-01T00:01:00Z",
+            ),
+            (
+                "assistant",
+                {
+                    "content": [
+                        {"type": "tool_use", "name": "Bash", "id": "2", "input": {}},
+                        {"type": "text", "text": "b" * 300},
+                    ]
+                },
+                "2025-01-01T00:02:00Z",
+            ),
+        ]
+        merged = merge_conversation_stats(
+            [analyze_conversation(first), analyze_conversation(second)]
+        )
+        assert merged == analyze_conversation(first + second)
+
 
 class TestFormatToolStats:
     """Tests for tool stats formatting."""
@@ -381,6 +520,11 @@ class TestFormatToolStats:
         """Test empty tool counts."""
         assert format_tool_stats({}) == ""
 
+    def test_orders_by_count_and_lowercases_unknown_tools(self):
+        """Test most-used tools come first, ties keep their original order."""
+        counts = {"Read": 2, "MyTool": 2, "Bash": 5}
+        assert format_tool_stats(counts) == "5 bash · 2 read · 2 mytool"
+
 
 class TestIsToolResultMessage:
     """Tests for tool result message detection."""
@@ -406,6 +550,24 @@ class TestIsToolResultMessage:
         assert is_tool_result_message({"content": "string"}) is False
 
 
+class TestRenderMessage:
+    """Tests for render_message."""
+
+    def test_renders_message_dict(self):
+        """Test that parsed message dicts are rendered directly."""
+        message = {"content": [{"type": "text", "text": "Hello **world**"}]}
+        result = render_message("assistant", message, "2025-01-01T00:00:00Z")
+        assert isinstance(result, Markup)
+        assert 'class="message assistant"' in result
+        assert "<strong>world</strong>" in result
+
+    def test_empty_message_renders_nothing(self):
+        """Test that empty messages produce no output."""
+        result = render_message("user", {}, "2025-01-01T00:00:00Z")
+        assert isinstance(result, Markup)
+        assert result == ""
+
+
 class TestInjectGistPreviewJs:
     """Tests for the inject_gist_preview_js function."""
 
@@ -774,6 +936,44 @@ class TestParseSessionFile:
         user_msg = next(e for e in result["loglines"] if e["type"] == "user")
         assert user_msg["message"]["content"] == "Create a hello world function"
 
+    def test_jsonl_decodes_utf8_and_skips_bad_lines(self, tmp_path):
+        """Test that non-ASCII text survives and undecodable lines are skipped."""
+        jsonl_file = tmp_path / "session.jsonl"
+        jsonl_file.write_bytes(
+            b'{"type": "user", "timestamp": "t", "message": {"content": "caf\xc3\xa9"}}\n'
+            b'{"type": "user", "message": {"content": "\xff"}}\n'
+        )
+        result = parse_session_file(jsonl_file)
+        assert [e["message"]["content"] for e in result["loglines"]] == ["café"]
+
+    def test_lone_surrogates_are_kept(self, tmp_path):
+        """Test that lines orjson rejects still parse, e.g. a truncated emoji."""
+        lines = (
+            '{"type": "user", "timestamp": "t1", "message": {"content": "Run it"}}\n'
+            '{"type": "user", "timestamp": "t2", "message": {"content": [{"type": "tool_result", "content": "cut off \\ud83d"}]}}\n'
+        )
+        jsonl_file = tmp_path / "session.jsonl"
+        jsonl_file.write_text(lines)
+        loglines = parse_session_file(jsonl_file)["loglines"]
+        assert len(loglines) == 2
+        assert loglines[1]["message"]["content"][0]["content"] == "cut off \ufffd"
+
+        json_file = tmp_path / "session.json"
+        json_file.write_text('{"loglines": [%s]}' % ",".join(lines.splitlines()))
+        assert parse_session_file(json_file)["loglines"] == loglines
+
+        output_dir = tmp_path / "output"
+        generate_html(jsonl_file, output_dir)
+        assert "cut off \ufffd" in (output_dir / "page-001.html").read_text()
+
+    def test_iter_session_entries_matches_parse(self):
+        """Test that streaming entries yields the same loglines as parsing."""
+        for name in ("sample_session.json", "sample_session.jsonl"):
+            fixture_path = Path(__file__).parent / name
+            entries = iter_session_entries(fixture_path)
+            assert not isinstance(entries, list)
+            assert list(entries) == parse_session_file(fixture_path)["loglines"]
+
     def test_jsonl_generates_html(self, output_dir, snapshot_html):
         """Test that JSONL files can be converted to HTML."""
         fixture_path = Path(__file__).parent / "sample_session.jsonl"
@@ -1,5 +1,6 @@
 """Tests for the web interface."""
 
+import json
 import tempfile
 from pathlib import Path
 
@@ -9,7 +10,7 @@ from fastapi.testclient import TestClient
 from claude_code_transcripts.web import create_app
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_projects_dir():
     """Create a mock ~/.claude/projects structure with test sessions."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -42,13 +43,46 @@ def mock_projects_dir():
         yield projects_dir
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def client(mock_projects_dir):
     """Create a test client for the web app."""
     app = create_app(projects_dir=mock_projects_dir)
     return TestClient(app)
 
 
+def user_line(content, timestamp="2025-01-01T10:00:00.000Z"):
+    """Build a JSONL line for a user message."""
+    return json.dumps(
+        {
+            "type": "user",
+            "timestamp": timestamp,
+            "message": {"role": "user", "content": content},
+        }
+    )
+
+
+@pytest.fixture
+def make_session(tmp_path):
+    """Write a session into its own projects dir and serve it.
+
+    Call it with a project name, a session id and the session's JSONL lines;
+    extra keyword arguments go to create_app. Returns (client, session path).
+    Tests that change session files use this rather than mock_projects_dir,
+    which is shared across the module.
+    """
+    projects_dir = tmp_path / "projects"
+
+    def make(project_name, session_id, lines, **app_options):
+        project = projects_dir / f"-home-user-projects-{project_name}"
+        project.mkdir(parents=True, exist_ok=True)
+        session = project / f"{session_id}.jsonl"
+        session.write_text("".join(line + "\n" for line in lines))
+        app = create_app(projects_dir=projects_dir, **app_options)
+        return TestClient(app), session
+
+    return make
+
+
 class TestProjectsPage:
     """Tests for the projects listing page."""
 
@@ -79,6 +113,86 @@ class TestProjectsPage:
         assert 'href="/project/project-b"' in response.text
 
 
+class TestProjectsCache:
+    """Tests for reusing the project listing between requests."""
+
+    def test_listing_is_reused_until_tree_changes(self, make_session, monkeypatch):
+        """Test that the tree is only re-scanned after it changes."""
+        from claude_code_transcripts.web import _cache
+
+        calls = []
+        original = _cache.find_all_sessions
+
+        def counting_find_all_sessions(folder):
+            calls.append(folder)
+            return original(folder)
+
+        monkeypatch.setattr(_cache, "find_all_sessions", counting_find_all_sessions)
+        client, session = make_session("cached", "one", [user_line("First")])
+
+        assert "1 session" in client.get("/").text
+        client.get("/")
+        client.get("/project/cached")
+        assert len(calls) == 1
+
+        # A new session in an existing project invalidates the cache
+        (session.parent / "two.jsonl").write_text(user_line("Second") + "\n")
+        assert "2 sessions" in client.get("/").text
+        assert len(calls) == 2
+
+    def test_concurrent_requests_share_one_walk(self, mock_projects_dir, monkeypatch):
+        """Test that recomputes are coalesced, in whichever event loop runs them."""
+        import asyncio
+
+        from claude_code_transcripts.web import _cache
+
+        calls = []
+        original = _cache.find_all_sessions
+
+        def counting_find_all_sessions(folder):
+            calls.append(folder)
+            return original(folder)
+
+        monkeypatch.setattr(_cache, "find_all_sessions", counting_find_all_sessions)
+        cache = _cache.SessionsCache(mock_projects_dir)
+
+        async def burst():
+            return await asyncio.gather(cache.get(), cache.get(), cache.get())
+
+        first = asyncio.run(burst())
+        assert len(calls) == 1
+        assert first[0] is first[1] is first[2]
+
+        # Forget the entry so a new loop has to wait on the lock again
+        cache._entry = None
+        asyncio.run(burst())
+        assert len(calls) == 2
+
+
+class TestRenderedMessageCache:
+    """Tests for reusing rendered messages between requests."""
+
+    def test_messages_are_rendered_once(self, make_session, monkeypatch):
+        """Test that viewing a session again reuses rendered messages."""
+        from claude_code_transcripts.web import _cache
+
+        calls = []
+        original = _cache.render_message
+
+        def counting_render_message(*args):
+            calls.append(args)
+            return original(*args)
+
+        monkeypatch.setattr(_cache, "render_message", counting_render_message)
+        client, _ = make_session("rendered", "once", [user_line("Render me once")])
+
+        first = client.get("/session/rendered/once").text
+        second = client.get("/session/rendered/once").text
+        assert "Render me once" in first
+        assert first == second
+        assert len(calls) == 1
+
+
 class TestEmptyProjectsDir:
     """Tests for when no projects exist."""
 
@@ -152,6 +266,97 @@ class TestSessionViewer:
         assert "Hello from project A" in response.text
         # Assistant response should appear
         assert "Hi there!" in response.text
+        assert "No messages in this session." not in response.text
+
+    def test_session_page_without_messages(self, make_session):
+        """Test that a session with no messages shows a placeholder."""
+        client, _ = make_session(
+            "quiet", "empty", ['{"type": "summary", "summary": "Nothing said"}']
+        )
+        response = client.get("/session/quiet/empty")
+        assert response.status_code == 200
+        assert "No messages in this session." in response.text
+
+    def test_long_session_keeps_message_order(self, make_session):
+        """Test that messages rendered in parallel chunks stay in order."""
+        lines = [
+            user_line(f"Message number {i:03d}", f"2025-01-01T10:00:{i:02d}.000Z")
+            for i in range(60)
+        ]
+        client, _ = make_session("long", "many", lines)
+        text = client.get("/session/long/many").text
+        positions = [text.index(f"Message number {i:03d}") for i in range(60)]
+        assert positions == sorted(positions)
+
+    def test_only_a_window_of_chunks_is_rendered_ahead(self, make_session, monkeypatch):
+        """Test that rendering doesn't run further ahead than the window."""
+        from concurrent.futures import Future
+
+        from claude_code_transcripts.web import routes
+
+        class CountingPool:
+            """Render chunks inline, tracking how many are awaiting pickup."""
+
+            in_flight = peak = 0
+
+            def submit(self, fn, *args):
+                CountingPool.in_flight += 1
+                CountingPool.peak = max(CountingPool.peak, CountingPool.in_flight)
+                future = Future()
+                future.set_result(fn(*args))
+                result = future.result
+
+                def collect(timeout=None):
+                    CountingPool.in_flight -= 1
+                    return result(timeout)
+
+                future.result = collect
+                return future
+
+        monkeypatch.setattr(routes, "_render_pool", CountingPool())
+        monkeypatch.setattr(routes, "_RENDER_CHUNK_SIZE", 1)
+        monkeypatch.setattr(routes, "_RENDER_WINDOW", 2)
+        lines = [user_line(f"Message number {i:03d}") for i in range(10)]
+        client, _ = make_session("long", "many", lines)
+        text = client.get("/session/long/many").text
+        positions = [text.index(f"Message number {i:03d}") for i in range(10)]
+        assert positions == sorted(positions)
+        assert CountingPool.peak == 2
+        assert CountingPool.in_flight == 0
+
+    def test_session_page_is_compressed(self, client):
+        """Test that session pages are gzipped for clients that accept it."""
+        response = client.get(
+            "/session/project-a/abc123", headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Hello from project A" in response.text
+
+    def test_session_as_msgpack(self, client):
+        """Test that msgpack clients get the parsed loglines, not HTML."""
+        import msgpack
+
+        response = client.get(
+            "/session/project-a/abc123",
+            headers={"Accept": "application/x-msgpack"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-msgpack"
+        assert "Accept" in response.headers["vary"]
+        loglines = msgpack.unpackb(response.content)
+        assert [logline["type"] for logline in loglines] == ["user", "assistant"]
+        assert loglines[0]["message"]["content"] == "Hello from project A"
+
+    def test_msgpack_and_html_etags_differ(self, client):
+        """Test that a cached HTML page never validates a msgpack request."""
+        html_etag = client.get("/session/project-a/abc123").headers["etag"]
+        response = client.get(
+            "/session/project-a/abc123",
+            headers={"Accept": "application/x-msgpack", "If-None-Match": html_etag},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-msgpack"
+        assert response.headers["etag"] != html_etag
 
     def test_session_page_has_breadcrumb(self, client):
         """Test that session page has breadcrumb navigation."""
@@ -170,6 +375,144 @@ class TestSessionViewer:
         assert response.status_code == 404
 
 
+class TestRenderedPageCache:
+    """Tests for serving rendered sessions from the disk cache."""
+
+    @pytest.fixture
+    def cached_client(self, mock_projects_dir, tmp_path):
+        """Create a test client that caches rendered pages in tmp_path."""
+        app = create_app(projects_dir=mock_projects_dir, cache_dir=tmp_path)
+        return TestClient(app)
+
+    @pytest.fixture
+    def cached_page(self, mock_projects_dir, tmp_path):
+        """Return the path the abc123 session's page is cached at."""
+        from claude_code_transcripts.web import _cache
+
+        session = mock_projects_dir / "-home-user-projects-project-a" / "abc123.jsonl"
+        return _cache.rendered_page_path(tmp_path, session, session.stat())
+
+    def test_page_is_written_and_served_from_disk(
+        self, cached_client, cached_page, monkeypatch
+    ):
+        """Test that a rendered session is reused without parsing it again."""
+        from claude_code_transcripts.web import routes
+
+        first = cached_client.get("/session/project-a/abc123")
+        assert cached_page.read_text() == first.text
+
+        def fail_parse(path):
+            raise AssertionError("session should not be parsed again")
+
+        monkeypatch.setattr(routes, "parse_session_file", fail_parse)
+        second = cached_client.get("/session/project-a/abc123")
+        assert second.status_code == 200
+        assert second.text == first.text
+        assert second.headers["etag"] == first.headers["etag"]
+
+    def test_compressed_copy_is_served_to_gzip_clients(
+        self, cached_client, cached_page
+    ):
+        """Test that a gzipped copy is stored and sent as-is."""
+        import gzip
+
+        from claude_code_transcripts.web import _cache
+
+        first = cached_client.get("/session/project-a/abc123")
+        page = _cache.compressed_page_path(cached_page)
+        assert gzip.decompress(page.read_bytes()).decode() == first.text
+
+        second = cached_client.get(
+            "/session/project-a/abc123", headers={"Accept-Encoding": "gzip"}
+        )
+        assert second.headers["content-encoding"] == "gzip"
+        assert second.text == first.text
+
+        plain = cached_client.get(
+            "/session/project-a/abc123", headers={"Accept-Encoding": "identity"}
+        )
+        assert "content-encoding" not in plain.headers
+        assert plain.text == first.text
+
+    def test_changed_session_is_rendered_again(self, make_session, tmp_path):
+        """Test that appending to a session replaces its cached page."""
+        cached_client, session = make_session(
+            "growing", "abc123", [user_line("Hello")], cache_dir=tmp_path / "cache"
+        )
+        cached_client.get("/session/growing/abc123")
+        with open(session, "a") as f:
+            f.write(user_line("Appended later", "2025-01-01T10:01:00.000Z") + "\n")
+        response = cached_client.get("/session/growing/abc123")
+        assert "Appended later" in response.text
+        (session_pages,) = (tmp_path / "cache").glob("pages/*/*-growing/abc123")
+        assert len(list(session_pages.glob("*.html"))) == 1
+
+    def test_same_mtime_with_new_size_is_rendered_again(self, make_session, tmp_path):
+        """Test that an append within the same mtime tick is not missed."""
+        import os
+
+        cached_client, session = make_session(
+            "growing", "abc123", [user_line("Hello")], cache_dir=tmp_path / "cache"
+        )
+        first = cached_client.get("/session/growing/abc123")
+        mtime_ns = session.stat().st_mtime_ns
+        with open(session, "a") as f:
+            f.write(user_line("Appended later", "2025-01-01T10:01:00.000Z") + "\n")
+        os.utime(session, ns=(mtime_ns, mtime_ns))
+        second = cached_client.get("/session/growing/abc123")
+        assert "Appended later" in second.text
+        assert second.headers["etag"] != first.headers["etag"]
+
+    def test_pages_for_deleted_sessions_are_pruned(self, make_session, tmp_path):
+        """Test that starting the app drops pages for removed sessions."""
+        from claude_code_transcripts.web import _cache
+
+        cache_dir = tmp_path / "cache"
+        cached_client, session = make_session(
+            "doomed", "abc123", [user_line("Hello")], cache_dir=cache_dir
+        )
+        cached_client.get("/session/doomed/abc123")
+        page = _cache.rendered_page_path(cache_dir, session, session.stat())
+        assert page.exists()
+
+        session.unlink()
+        create_app(projects_dir=tmp_path / "projects", cache_dir=cache_dir)
+        assert not page.parent.exists()
+
+    def test_stray_files_in_cache_are_ignored(self, mock_projects_dir, tmp_path):
+        """Test that files such as .DS_Store don't stop the app starting."""
+        from claude_code_transcripts.web import _cache
+
+        version_dir = tmp_path / "pages" / _cache.RENDER_VERSION
+        (version_dir / "project").mkdir(parents=True)
+        for stray in (
+            tmp_path / "pages" / ".DS_Store",
+            version_dir / ".DS_Store",
+            version_dir / "project" / ".DS_Store",
+        ):
+            stray.write_text("")
+        create_app(projects_dir=mock_projects_dir, cache_dir=tmp_path)
+        assert (version_dir / ".DS_Store").exists()
+
+    def test_pages_from_other_versions_are_pruned(self, mock_projects_dir, tmp_path):
+        """Test that pages rendered by other code versions are dropped."""
+        stale = tmp_path / "pages" / "0.0-old" / "project" / "session"
+        stale.mkdir(parents=True)
+        (stale / "1-1.html").write_text("old")
+        create_app(projects_dir=mock_projects_dir, cache_dir=tmp_path)
+        assert not (tmp_path / "pages" / "0.0-old").exists()
+
+    def test_matching_etag_returns_not_modified(self, client):
+        """Test that a client holding the current page gets a 304."""
+        etag = client.get("/session/project-a/abc123").headers["etag"]
+        assert etag.startswith('W/"')
+        response = client.get(
+            "/session/project-a/abc123", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert response.text == ""
+
+
 class TestServeCommand:
     """Tests for the serve CLI command."""
 
@@ -187,3 +530,4 @@ class TestServeCommand:
         assert "--port" in result.output
         assert "--reload" in result.output
         assert "--projects-dir" in result.output
+        assert "--cache-dir" in result.output